@@ -1,63 +1,240 @@
-from dotenv import load_dotenv
+import difflib
 import os
 import re
+import sys
 import time
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from functools import cache, lru_cache
+from typing import TYPE_CHECKING
 from dateutil.parser import parse
-from supabase import create_client, Client
-from langchain_groq import ChatGroq
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain.memory import ConversationBufferMemory
-from langchain.chains import ConversationChain
+# dotenv, supabase/httpx and langchain are imported inside the accessors below
+# so importing this module stays cheap until a client is actually needed
+if TYPE_CHECKING:
+    from supabase import Client
+    from langchain.chains import ConversationChain
+    from langchain_groq import ChatGroq
 
 # ---------------------- Setup ----------------------
-load_dotenv()
-groq_api_key = os.getenv("GROQ_API_KEY")
-supabase_url = os.getenv("SUPABASE_URL")
-supabase_key = os.getenv("SUPABASE_KEY")
+@cache
+def _load_env() -> None:
+    """Load .env into the environment once, when a client first needs it"""
+    from dotenv import load_dotenv
+    load_dotenv()
 
-if not groq_api_key:
-    raise ValueError("GROQ_API_KEY not found in .env file")
-if not supabase_url or not supabase_key:
-    raise ValueError("SUPABASE_URL or SUPABASE_KEY not found in .env file")
+def _groq_api_key() -> str:
+    """Return GROQ_API_KEY, raising if it is not configured"""
+    _load_env()
+    groq_api_key = os.getenv("GROQ_API_KEY")
+    if not groq_api_key:
+        raise ValueError("GROQ_API_KEY not found in .env file")
+    return groq_api_key
 
 # ---------------------- Supabase Setup ----------------------
-print("\nInitializing Supabase connection...")
-try:
-    supabase: Client = create_client(supabase_url, supabase_key)
-    print("✅ Supabase client created")
-except Exception as e:
-    print(f"❌ Failed to create Supabase client: {str(e)}")
-    exit(1)
+@cache
+def get_supabase() -> "Client":
+    """Create the Supabase client on first use and reuse it afterwards"""
+    import httpx
+    from supabase import create_client, ClientOptions
+    
+    _load_env()
+    supabase_url = os.getenv("SUPABASE_URL")
+    supabase_key = os.getenv("SUPABASE_KEY")
+    if not supabase_url or not supabase_key:
+        raise ValueError("SUPABASE_URL or SUPABASE_KEY not found in .env file")
+    
+    # One pooled HTTP/2 session shared by every reminder query, so repeated
+    # calls reuse the TLS connection instead of reconnecting
+    http_client = httpx.Client(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=40),
+        timeout=httpx.Timeout(30.0),
+        follow_redirects=True,
+    )
+    return create_client(
+        supabase_url,
+        supabase_key,
+        options=ClientOptions(httpx_client=http_client)
+    )
+
+# ---------------------- Regex Patterns ----------------------
+# Compiled once at import so the parsers below skip the re module cache lookup
+
+# Category as written -> value stored in the database
+_CATEGORIES = {
+    "rent": "rent",
+    "electricity": "electricity",
+    "water": "water",
+    "gas": "gas",
+    "credit card": "credit_card",
+    "loan": "loan",
+    "mortgage": "mortgage",
+    "insurance": "insurance",
+    "subscription": "subscription",
+    "phone": "phone",
+    "internet": "internet",
+}
+# ASCII-only matching inside the group: under IGNORECASE, Unicode would also let
+# "ı" and "ſ" match i and s, capturing text that is not a key of _CATEGORIES
+_CATEGORY_ALT = "(?a:" + "|".join(name.replace(" ", r"\s+") for name in _CATEGORIES) + ")"
+
+# Field extractors for extract_reminder_info as (field, name, pattern), listed in
+# priority order: within a field the earliest entry that matches anywhere wins.
+# Searched one by one: a fused lookahead alternation was measured ~2x slower.
+# Bare digit runs carry a (?<![\d.]) guard so a search cannot restart inside a
+# number and backtrack over it again, which made long digit input quadratic
+_FIELD_PATS = [
+    (field, name, re.compile(pat, re.IGNORECASE))
+    for field, name, pat in [
+        ("amt", "amt_dollar", r'\$(?P<val>\d+(?:\.\d{2})?)'),  # $100 or $100.50
+        ("amt", "amt_amount", r'amount\s+(?:of\s+)?\$?(?P<val>\d+(?:\.\d{2})?)'),  # amount of $100
+        ("amt", "amt_word", r'(?<![\d.])(?P<val>\d+(?:\.\d{2})?)\s*dollars?'),  # 100 dollars
+        ("amt", "amt_pay", r'pay\s+\$?(?P<val>\d+(?:\.\d{2})?)'),  # pay $100
+        ("date", "date_month", r'(?:on|by|due)\s+(?P<val>(?:january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{1,2}(?:,?\s+\d{4})?)'),
+        ("date", "date_numeric", r'(?:on|by|due)\s+(?P<val>\d{1,2}[-/]\d{1,2}(?:[-/]\d{2,4})?)'),
+        ("date", "date_iso", r'(?:on|by|due)\s+(?P<val>\d{4}-\d{1,2}-\d{1,2})'),
+        ("date", "date_relative", r'(?P<val>tomorrow|today|next\s+week|next\s+month)'),
+        ("date", "date_days", r'(?:in\s+)?(?<![\d.])(?P<val>\d+)\s+days?'),
+        ("cat", "cat_for", rf'(?:for|category)\s+(?P<val>{_CATEGORY_ALT})'),
+        ("cat", "cat_bill", rf'(?P<val>{_CATEGORY_ALT})\s+(?:payment|bill)'),
+        ("rec", "rec_named", r'(?P<val>weekly|monthly|yearly|daily)\s+(?:reminder|payment)'),
+        ("rec", "rec_every", r'(?:every|repeat)\s+(?P<val>\d+)\s+(?P<unit>days?|weeks?|months?|years?)'),
+    ]
+]
+# Days per recurrence unit, keyed by every spelling rec_every can capture
+_RECURRENCE_DAYS = {
+    "day": 1, "days": 1,
+    "week": 7, "weeks": 7,
+    "month": 30, "months": 30,
+    "year": 365, "years": 365,
+}
+# strptime formats for the absolute date shapes matched above; dateutil is
+# only used when none of them fit
+_DATE_FORMATS = {
+    "date_month": ("%B %d, %Y", "%B %d %Y", "%B %d"),
+    "date_numeric": ("%m/%d/%Y", "%m/%d/%y", "%m/%d", "%m-%d-%Y", "%m-%d-%y", "%m-%d"),
+    "date_iso": ("%Y-%m-%d",),
+}
+
+# Title cleanup
+# Everything stripped from the title in one pass: command words, date
+# references (a relative keyword drops the rest of the text), then amounts
+_TITLE_STRIP = re.compile(
+    r'\b(?:create|add|set|new|reminder|for|to|pay|payment|bill)\b'
+    r'|\b(?:on|by|due|tomorrow|today|next\s+week|next\s+month)\b.*'
+    r'|\d{1,2}[-/]\d{1,2}(?:[-/]\d{2,4})?'
+    r'|(?:january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{1,2}(?:,?\s+\d{4})?'
+    r'|\bin\s+\d+\s+days?'
+    r'|\$?\d+(?:\.\d{2})?\s*(?:dollars?)?',
+    re.IGNORECASE,
+)
+_WS = re.compile(r'\s+')
+# Removes the detected category from the title, one pattern per category
+_CATEGORY_STRIP = {
+    category: re.compile(r'\b' + name.replace(" ", r"\s+") + r'\b', re.IGNORECASE | re.ASCII)
+    for name, category in _CATEGORIES.items()
+}
+
+# Command parsing
+# Every command below needs at least one of these words; other messages skip
+# the command regexes entirely
+_REMINDER_KEYWORDS = frozenset({
+    "create", "add", "set", "new", "remind", "reminder", "reminders",
+    "delete", "remove", "cancel", "list", "show", "view",
+    "mark", "complete", "done",
+})
+_WORD = re.compile(r'[a-z]+')
+
+_DELETE_PATS = [
+    re.compile(r'(?:delete|remove|cancel)\s+reminder(?:\s*:\s*|\s+)(.+)'),
+    re.compile(r'(?:delete|remove|cancel)\s+(.+?)(?:\s+reminder)?$'),
+    re.compile(r'remove\s+(.+)'),
+    re.compile(r'cancel\s+(.+)'),
+]
+_LIST_CMD_RE = re.compile(r'(?:list|show|view|my) reminders')
+_MARK_CMD_RE = re.compile(r'mark as done|complete reminder|payment done')
+_FILLER_SUB = re.compile(r'\b(?:reminder|the|my)\b')
+_MARK_PAT = re.compile(r'(?:mark|complete)\s+(.+?)(?:\s+as\s+done)?$')
+
+_CREATE_PATS = [
+    re.compile(r'(?:create|add|set|new)\s+reminder\s+(.+)', re.IGNORECASE),
+    re.compile(r'remind\s+me\s+(?:to\s+)?(.+)', re.IGNORECASE),
+    re.compile(r'set\s+(?:a\s+)?reminder\s+(.+)', re.IGNORECASE),
+    re.compile(r'add\s+reminder\s+(.+)', re.IGNORECASE),
+]
 
 # ---------------------- Helper Functions ----------------------
-def parse_date(date_str: str) -> str:
-    """Parse various date formats and return ISO format"""
+@lru_cache(maxsize=1024)
+def _parse_absolute(date_str: str, formats: tuple, today: date) -> str:
+    """Parse an absolute date string to ISO format (cached, raises on failure)
+
+    today fills in missing fields (e.g. the year of "August 15") and is part
+    of the cache key, so cached results never outlive the day they were made
+    """
+    for fmt in formats:
+        # Dates without a year fall in the current one, as with dateutil. The
+        # year is parsed along with the rest rather than patched in afterwards,
+        # so "February 29" works in leap years
+        if "%Y" not in fmt and "%y" not in fmt:
+            date_str_fmt, fmt = f"{date_str} {today.year}", fmt + " %Y"
+        else:
+            date_str_fmt = date_str
+        try:
+            parsed_date = datetime.strptime(date_str_fmt, fmt)
+        except ValueError:
+            continue
+        break
+    else:
+        # ISO strings (YYYY-MM-DD...) skip dateutil's format probing
+        if date_str[:4].isdigit() and date_str[4:5] == "-":
+            try:
+                parsed_date = datetime.fromisoformat(date_str)
+            except ValueError:
+                parsed_date = parse(date_str, default=datetime(today.year, today.month, today.day))
+        else:
+            parsed_date = parse(date_str, default=datetime(today.year, today.month, today.day))
+    # If no time specified, set to 9 AM
+    if parsed_date.time() == datetime.min.time():
+        parsed_date = parsed_date.replace(hour=9)
+    
+    return parsed_date.strftime('%Y-%m-%d %H:%M:%S+00:00')
+
+def parse_date(date_str: str, formats: tuple = (), now: datetime = None) -> str:
+    """Parse various date formats and return ISO format
+
+    formats: strptime formats to try before falling back to dateutil
+    now: reference time for relative dates and missing date fields
+         (defaults to datetime.now())
+    """
+    if now is None:
+        now = datetime.now()
+    
+    # Handle relative dates (depend on the current time, so never cached)
+    date_str_lower = date_str.lower()
+    if 'today' in date_str_lower:
+        return now.strftime('%Y-%m-%d %H:%M:%S+00:00')
+    elif 'tomorrow' in date_str_lower or not date_str_lower.strip():
+        return (now + timedelta(days=1)).strftime('%Y-%m-%d %H:%M:%S+00:00')
+    elif 'next week' in date_str_lower:
+        return (now + timedelta(weeks=1)).strftime('%Y-%m-%d %H:%M:%S+00:00')
+    elif 'next month' in date_str_lower:
+        return (now + timedelta(days=30)).strftime('%Y-%m-%d %H:%M:%S+00:00')
+    
+    # Try to parse the date
     try:
-        # Handle relative dates
-        date_str_lower = date_str.lower()
-        if 'today' in date_str_lower:
-            return datetime.now().strftime('%Y-%m-%d %H:%M:%S+00:00')
-        elif 'tomorrow' in date_str_lower:
-            return (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d %H:%M:%S+00:00')
-        elif 'next week' in date_str_lower:
-            return (datetime.now() + timedelta(weeks=1)).strftime('%Y-%m-%d %H:%M:%S+00:00')
-        elif 'next month' in date_str_lower:
-            return (datetime.now() + timedelta(days=30)).strftime('%Y-%m-%d %H:%M:%S+00:00')
-        
-        # Try to parse the date
-        parsed_date = parse(date_str)
-        # If no time specified, set to 9 AM
-        if parsed_date.time() == datetime.min.time():
-            parsed_date = parsed_date.replace(hour=9)
-        
-        return parsed_date.strftime('%Y-%m-%d %H:%M:%S+00:00')
-    except:
+        return _parse_absolute(date_str, formats, now.date())
+    except (ValueError, OverflowError, TypeError):
         # Default to tomorrow if parsing fails
-        return (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d %H:%M:%S+00:00')
+        return (now + timedelta(days=1)).strftime('%Y-%m-%d %H:%M:%S+00:00')
+
+@lru_cache(maxsize=2048)
+def _fmt_due(iso: str) -> str:
+    """Format a stored ISO due date for display (cached per ISO string)"""
+    return datetime.fromisoformat(iso).strftime('%b %d, %Y %I:%M %p')
 
-def extract_reminder_info(text: str) -> dict:
+def extract_reminder_info(text: str, now: datetime = None) -> dict:
     """Extract reminder information from natural language text"""
+    if now is None:
+        now = datetime.now()
     info = {
         "title": None,
         "amount": 0,
@@ -67,103 +244,56 @@ def extract_reminder_info(text: str) -> dict:
         "custom_recurrence_days": None
     }
     
-    # Extract amount (look for $X or amount X)
-    amount_patterns = [
-        r'\$(\d+(?:\.\d{2})?)',  # $100 or $100.50
-        r'amount\s+(?:of\s+)?\$?(\d+(?:\.\d{2})?)',  # amount of $100
-        r'(\d+(?:\.\d{2})?)\s*dollars?',  # 100 dollars
-        r'pay\s+\$?(\d+(?:\.\d{2})?)',  # pay $100
-    ]
+    # Collect the highest-priority match for each field
+    best = {}
+    for field, name, pattern in _FIELD_PATS:
+        if field not in best:
+            match = pattern.search(text)
+            if match:
+                best[field] = (name, match)
     
-    for pattern in amount_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            try:
-                info["amount"] = float(match.group(1))
-                break
-            except ValueError:
-                continue
+    # Extract amount (look for $X or amount X)
+    if "amt" in best:
+        name, match = best["amt"]
+        info["amount"] = float(match.group("val"))
     
     # Extract date information
-    date_patterns = [
-        r'(?:on|by|due)\s+((?:january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{1,2}(?:,?\s+\d{4})?)',
-        r'(?:on|by|due)\s+(\d{1,2}[-/]\d{1,2}(?:[-/]\d{2,4})?)',
-        r'(?:on|by|due)\s+(\d{4}-\d{1,2}-\d{1,2})',
-        r'(tomorrow|today|next\s+week|next\s+month)',
-        r'(?:in\s+)?(\d+)\s+days?',
-    ]
-    
-    for pattern in date_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            date_str = match.group(1)
-            if re.match(r'\d+', date_str):  # Handle "in X days"
-                days = int(date_str)
-                info["due_date"] = (datetime.now() + timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S+00:00')
-            else:
-                info["due_date"] = parse_date(date_str)
-            break
+    if "date" in best:
+        name, match = best["date"]
+        date_str = match.group("val")
+        if name == "date_days":  # Handle "in X days"
+            days = int(date_str)
+            info["due_date"] = (now + timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S+00:00')
+        else:
+            info["due_date"] = parse_date(date_str, _DATE_FORMATS.get(name, ()), now)
     
     # If no date found, default to tomorrow
     if not info["due_date"]:
-        info["due_date"] = parse_date("tomorrow")
+        info["due_date"] = (now + timedelta(days=1)).strftime('%Y-%m-%d %H:%M:%S+00:00')
     
     # Extract category
-    category_patterns = [
-        r'(?:for|category)\s+(rent|electricity|water|gas|credit\s+card|loan|mortgage|insurance|subscription|phone|internet)',
-        r'(rent|electricity|water|gas|credit\s+card|loan|mortgage|insurance|subscription|phone|internet)\s+(?:payment|bill)'
-    ]
-    
-    for pattern in category_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            info["category"] = match.group(1).replace(" ", "_")
-            break
+    if "cat" in best:
+        name, match = best["cat"]
+        info["category"] = _CATEGORIES[" ".join(match.group("val").lower().split())]
     
     # Extract recurrence
-    recurrence_patterns = [
-        r'(weekly|monthly|yearly|daily)\s+(?:reminder|payment)',
-        r'(?:every|repeat)\s+(\d+)\s+(days?|weeks?|months?|years?)'
-    ]
-    
-    for pattern in recurrence_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            if match.group(1) in ['weekly', 'monthly', 'yearly', 'daily']:
-                info["recurrence"] = match.group(1)
-            else:
-                info["custom_recurrence_days"] = int(match.group(1))
-                if 'day' in match.group(2):
-                    info["recurrence"] = "custom"
-                elif 'week' in match.group(2):
-                    info["custom_recurrence_days"] *= 7
-                    info["recurrence"] = "custom"
-                elif 'month' in match.group(2):
-                    info["custom_recurrence_days"] *= 30
-                    info["recurrence"] = "custom"
-                elif 'year' in match.group(2):
-                    info["custom_recurrence_days"] *= 365
-                    info["recurrence"] = "custom"
-            break
+    if "rec" in best:
+        name, match = best["rec"]
+        if name == "rec_named":
+            info["recurrence"] = match.group("val").lower()
+        else:
+            unit_days = _RECURRENCE_DAYS[match.group("unit").lower()]
+            info["custom_recurrence_days"] = int(match.group("val")) * unit_days
+            info["recurrence"] = "custom"
     
     # Extract the title (everything except amount, date, and category references)
-    title_text = text
-    # Remove common command words
-    title_text = re.sub(r'\b(?:create|add|set|new|reminder|for|to|pay|payment|bill)\b', '', title_text, flags=re.IGNORECASE)
-    # Remove amount references
-    title_text = re.sub(r'\$?\d+(?:\.\d{2})?\s*(?:dollars?)?', '', title_text)
-    # Remove date references
-    title_text = re.sub(r'\b(?:on|by|due|tomorrow|today|next\s+week|next\s+month)\b.*', '', title_text, flags=re.IGNORECASE)
-    title_text = re.sub(r'\d{1,2}[-/]\d{1,2}(?:[-/]\d{2,4})?', '', title_text)
-    title_text = re.sub(r'(?:january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{1,2}(?:,?\s+\d{4})?', '', title_text, flags=re.IGNORECASE)
-    title_text = re.sub(r'in\s+\d+\s+days?', '', title_text, flags=re.IGNORECASE)
+    title_text = _TITLE_STRIP.sub('', text)
     # Remove category references
     if info["category"]:
-        title_text = re.sub(info["category"].replace("_", " "), '', title_text, flags=re.IGNORECASE)
+        title_text = _CATEGORY_STRIP[info["category"]].sub('', title_text)
     
     # Clean up the title
-    title_text = re.sub(r'\s+', ' ', title_text).strip()
-    title_text = title_text.strip('.,!?')
+    title_text = _WS.sub(' ', title_text).strip(' .,!?')
     
     if title_text:
         info["title"] = title_text
@@ -173,54 +303,45 @@ def extract_reminder_info(text: str) -> dict:
     
     return info
 
-def parse_reminder_request(user_input: str) -> dict:
-    """Parse user input for reminder commands"""
+def parse_reminder_request(user_input: str, now: datetime = None) -> dict:
+    """Parse user input for reminder commands
+
+    now: reference time for due dates (defaults to datetime.now())
+    """
     try:
         user_input_lower = user_input.lower()
+        if _REMINDER_KEYWORDS.isdisjoint(_WORD.findall(user_input_lower)):
+            return {"action": "none"}
         
         # Enhanced delete patterns
-        delete_patterns = [
-            r'(?:delete|remove|cancel)\s+reminder(?:\s*:\s*|\s+)(.+)',
-            r'(?:delete|remove|cancel)\s+(.+?)(?:\s+reminder)?$',
-            r'remove\s+(.+)',
-            r'cancel\s+(.+)',
-        ]
-        
-        for pattern in delete_patterns:
-            delete_match = re.search(pattern, user_input_lower)
+        for pattern in _DELETE_PATS:
+            delete_match = pattern.search(user_input_lower)
             if delete_match:
                 title = delete_match.group(1).strip()
-                title = re.sub(r'\b(?:reminder|the|my)\b', '', title).strip()
+                title = _FILLER_SUB.sub('', title).strip()
                 if title:
                     return {"action": "delete", "title": title}
                 break
         
         # Check for list commands
-        if any(cmd in user_input_lower for cmd in ["list reminders", "show reminders", "my reminders", "view reminders"]):
+        if _LIST_CMD_RE.search(user_input_lower):
             return {"action": "list"}
         
         # Check for mark as done
-        if any(cmd in user_input_lower for cmd in ["mark as done", "complete reminder", "payment done"]):
-            mark_match = re.search(r'(?:mark|complete)\s+(.+?)(?:\s+as\s+done)?$', user_input_lower)
+        if _MARK_CMD_RE.search(user_input_lower):
+            mark_match = _MARK_PAT.search(user_input_lower)
             if mark_match:
                 title = mark_match.group(1).strip()
-                title = re.sub(r'\b(?:reminder|the|my)\b', '', title).strip()
+                title = _FILLER_SUB.sub('', title).strip()
                 if title:
                     return {"action": "mark_done", "title": title}
         
         # Check for create command patterns
-        create_patterns = [
-            r'(?:create|add|set|new)\s+reminder\s+(.+)',
-            r'remind\s+me\s+(?:to\s+)?(.+)',
-            r'set\s+(?:a\s+)?reminder\s+(.+)',
-            r'add\s+reminder\s+(.+)',
-        ]
-        
-        for pattern in create_patterns:
-            match = re.search(pattern, user_input, re.IGNORECASE)
+        for pattern in _CREATE_PATS:
+            match = pattern.search(user_input)
             if match:
                 reminder_text = match.group(1)
-                info = extract_reminder_info(reminder_text)
+                info = extract_reminder_info(reminder_text, now if now is not None else datetime.now())
                 return {
                     "action": "create",
                     "title": info["title"],
@@ -238,6 +359,35 @@ def parse_reminder_request(user_input: str) -> dict:
         return {"action": "none"}
 
 # ---------------------- Reminder Functions ----------------------
+# Columns the reminder views actually read; fetched instead of "*"
+_COLS = "id,title,due_date,amount,category,recurrence,custom_recurrence_days,is_done"
+
+# In-process copy of reminder titles (lowercased -> original) for "did you mean"
+# suggestions; kept current on create/delete and reloaded after the TTL so
+# edits made outside this session still show up
+_TITLE_CACHE: dict = {}
+_TITLE_CACHE_TTL = 60
+_title_cache_loaded_at = None
+
+def _fill_title_cache(rows: list) -> None:
+    """Replace the cached titles with those in rows"""
+    global _title_cache_loaded_at
+    _TITLE_CACHE.clear()
+    _TITLE_CACHE.update({r['title'].lower(): r['title'] for r in rows})
+    _title_cache_loaded_at = time.monotonic()
+
+def _cached_titles() -> dict:
+    """Return the cached titles, loading them from Supabase when missing or stale"""
+    if _title_cache_loaded_at is None or time.monotonic() - _title_cache_loaded_at > _TITLE_CACHE_TTL:
+        result = get_supabase().table("payment_reminders").select("title").limit(200).execute()
+        _fill_title_cache(result.data or [])
+    return _TITLE_CACHE
+
+def _forget_titles(rows: list) -> None:
+    """Drop deleted reminders from the title cache"""
+    for r in rows:
+        _TITLE_CACHE.pop(r['title'].lower(), None)
+
 def create_reminder(title: str, due_date: str, amount: float = 0, category: str = None, recurrence: str = None, custom_recurrence_days: int = None) -> dict:
     """Create reminder with given details"""
     try:
@@ -254,9 +404,10 @@ def create_reminder(title: str, due_date: str, amount: float = 0, category: str
         # Remove None values
         reminder_data = {k: v for k, v in reminder_data.items() if v is not None}
         
-        result = supabase.table("payment_reminders").insert(reminder_data).execute()
+        result = get_supabase().table("payment_reminders").insert(reminder_data).execute()
         
         if result.data:
+            _TITLE_CACHE[result.data[0]['title'].lower()] = result.data[0]['title']
             return {
                 "success": True,
                 "data": result.data[0],
@@ -269,13 +420,16 @@ def create_reminder(title: str, due_date: str, amount: float = 0, category: str
 def list_reminders(show_all: bool = False) -> dict:
     """List reminders from Supabase"""
     try:
-        query = supabase.table("payment_reminders").select("*")
+        query = get_supabase().table("payment_reminders").select(_COLS)
         
         if not show_all:
             query = query.eq("is_done", False)
             
         result = query.order("due_date").execute()
         
+        if show_all and result.data:
+            _fill_title_cache(result.data)
+        
         return {"success": True, "data": result.data} if result.data else {"success": True, "data": []}
     except Exception as e:
         return {"success": False, "message": f"Database error: {str(e)}"}
@@ -284,37 +438,30 @@ def delete_reminder(reminder_id: str = None, title: str = None) -> dict:
     """Delete a reminder by ID or title"""
     try:
         if reminder_id:
-            result = supabase.table("payment_reminders").delete().eq("id", reminder_id).execute()
+            result = get_supabase().table("payment_reminders").delete().eq("id", reminder_id).execute()
+            _forget_titles(result.data or [])
             return {
                 "success": bool(result.data), 
                 "message": f"Reminder deleted successfully!" if result.data else f"No reminder found with ID {reminder_id}",
                 "deleted_count": len(result.data) if result.data else 0
             }
         elif title:
-            search_result = supabase.table("payment_reminders").select("*").ilike("title", f"%{title}%").execute()
-            
-            if not search_result.data:
-                search_result = supabase.table("payment_reminders").select("*").eq("title", title).execute()
+            # Match + delete happens server-side (see reminder_functions.sql)
+            result = get_supabase().rpc("delete_reminder_fuzzy", {"search": title}).select("title").execute()
             
-            if not search_result.data:
-                all_reminders = supabase.table("payment_reminders").select("title").execute()
-                if all_reminders.data:
-                    reminder_titles = [r['title'].lower() for r in all_reminders.data]
-                    suggestions = [title for title in reminder_titles if any(word in title for word in title.split())]
-                    
-                    if suggestions:
-                        return {
-                            "success": False, 
-                            "message": f"No reminder found matching '{title}'. Did you mean: {', '.join(suggestions[:3])}?"
-                        }
+            if not result.data:
+                reminder_titles = _cached_titles()
+                suggestions = difflib.get_close_matches(title.lower(), reminder_titles, n=3, cutoff=0.6)
+                
+                if suggestions:
+                    return {
+                        "success": False, 
+                        "message": f"No reminder found matching '{title}'. Did you mean: {', '.join(reminder_titles[s] for s in suggestions)}?"
+                    }
                 
                 return {"success": False, "message": f"No reminder found matching '{title}'"}
             
-            result = supabase.table("payment_reminders").delete().ilike("title", f"%{title}%").execute()
-            
-            if not result.data:
-                result = supabase.table("payment_reminders").delete().eq("title", title).execute()
-            
+            _forget_titles(result.data)
             deleted_count = len(result.data) if result.data else 0
             
             if deleted_count > 0:
@@ -344,16 +491,14 @@ def mark_reminder_done(reminder_id: str = None, title: str = None) -> dict:
     """Mark a reminder as done"""
     try:
         if reminder_id:
-            result = supabase.table("payment_reminders").update({"is_done": True}).eq("id", reminder_id).execute()
+            result = get_supabase().table("payment_reminders").update({"is_done": True}).eq("id", reminder_id).execute()
             return {
                 "success": bool(result.data),
                 "message": f"Reminder marked as done!" if result.data else f"No reminder found with ID {reminder_id}"
             }
         elif title:
-            result = supabase.table("payment_reminders").update({"is_done": True}).ilike("title", f"%{title}%").execute()
-            
-            if not result.data:
-                result = supabase.table("payment_reminders").update({"is_done": True}).eq("title", title).execute()
+            # Match + update happens server-side (see reminder_functions.sql)
+            result = get_supabase().rpc("mark_reminder_done_fuzzy", {"search": title}).select("title").execute()
             
             if result.data:
                 if len(result.data) == 1:
@@ -391,34 +536,46 @@ Key reminder fields in our system:
 
 Always be helpful, clear, and encouraging about financial management."""
 
-# ---------------------- Memory Setup ----------------------
-memory = ConversationBufferMemory(
-    memory_key="history",
-    return_messages=True,
-    human_prefix="Client",
-    ai_prefix="Advisor"
-)
-
 # ---------------------- LLM Setup ----------------------
-llm = ChatGroq(
-    temperature=0.3,
-    model_name="llama3-8b-8192",
-    groq_api_key=groq_api_key
-)
+@cache
+def get_llm() -> "ChatGroq":
+    """Create the Groq chat model on first use"""
+    from langchain_groq import ChatGroq
+    
+    return ChatGroq(
+        temperature=0.3,
+        model_name="llama3-8b-8192",
+        groq_api_key=_groq_api_key()
+    )
 
 # ---------------------- Conversation Setup ----------------------
-prompt = ChatPromptTemplate.from_messages([
-    ("system", finance_persona),
-    MessagesPlaceholder(variable_name="history"),
-    ("human", "{input}"),
-])
-
-conversation = ConversationChain(
-    llm=llm,
-    prompt=prompt,
-    memory=memory,
-    verbose=False
-)
+@cache
+def get_conversation() -> "ConversationChain":
+    """Build the advisor conversation (prompt + memory) on first use"""
+    from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+    from langchain.memory import ConversationBufferMemory
+    from langchain.chains import ConversationChain
+    
+    llm = get_llm()
+    memory = ConversationBufferMemory(
+        memory_key="history",
+        return_messages=True,
+        human_prefix="Client",
+        ai_prefix="Advisor"
+    )
+    
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", finance_persona),
+        MessagesPlaceholder(variable_name="history"),
+        ("human", "{input}"),
+    ])
+    
+    return ConversationChain(
+        llm=llm,
+        prompt=prompt,
+        memory=memory,
+        verbose=False
+    )
 
 # ---------------------- Main Chat Function ----------------------
 def financial_chat(user_input: str) -> str:
@@ -436,7 +593,7 @@ def financial_chat(user_input: str) -> str:
             )
             if result["success"]:
                 reminder = result["data"]
-                due_display = datetime.fromisoformat(reminder['due_date'].replace('+00:00', '')).strftime('%b %d, %Y %I:%M %p')
+                due_display = _fmt_due(reminder['due_date'])
                 response = [
                     f"✅ {result['message']}",
                     f"📝 Title: {reminder['title']}",
@@ -482,32 +639,31 @@ def financial_chat(user_input: str) -> str:
             if not result["data"]:
                 return "📋 You don't have any reminders set up yet. Would you like to create one?"
                 
-            reminders = []
-            for idx, r in enumerate(result["data"]):
-                due_display = datetime.fromisoformat(r['due_date'].replace('+00:00', '')).strftime('%b %d, %Y %I:%M %p')
+            # Collect every output line in one flat list and join once at the end
+            header = "📋 Your Reminders" + (" (including completed)" if show_all else " (pending only)")
+            parts = [header]
+            append = parts.append
+            for idx, r in enumerate(result["data"], 1):
+                due_display = _fmt_due(r['due_date'])
                 status = "✅ Done" if r['is_done'] else "🟡 Pending"
-                reminder_str = [
-                    f"{idx+1}. {status} - 📝 {r['title']}",
-                    f"   📅 Due: {due_display}",
-                    f"   💰 Amount: ${r['amount']:.2f}",
-                ]
+                append("")
+                append(f"{idx}. {status} - 📝 {r['title']}")
+                append(f"   📅 Due: {due_display}")
+                append(f"   💰 Amount: ${r['amount']:.2f}")
                 
                 if r['category']:
-                    reminder_str.append(f"   🏷️ Category: {r['category'].replace('_', ' ').title()}")
+                    append(f"   🏷️ Category: {r['category'].replace('_', ' ').title()}")
                 
                 if r['recurrence']:
                     if r['recurrence'] == 'custom':
-                        reminder_str.append(f"   🔄 Repeats every {r['custom_recurrence_days']} days")
+                        append(f"   🔄 Repeats every {r['custom_recurrence_days']} days")
                     else:
-                        reminder_str.append(f"   🔄 Repeats {r['recurrence']}")
-                
-                reminders.append("\n".join(reminder_str))
-                
-            header = "📋 Your Reminders" + (" (including completed)" if show_all else " (pending only)")
-            return header + "\n\n" + "\n\n".join(reminders)
+                        append(f"   🔄 Repeats {r['recurrence']}")
+            
+            return "\n".join(parts)
         
         # Normal financial conversation
-        response = conversation.invoke({"input": user_input})
+        response = get_conversation().invoke({"input": user_input})
         return response["response"]
         
     except Exception as e:
@@ -515,6 +671,21 @@ def financial_chat(user_input: str) -> str:
 
 # ---------------------- Main Execution ----------------------
 if __name__ == "__main__":
+    # Fail at startup, not on the first chat message, if the LLM key is missing
+    try:
+        _groq_api_key()
+    except ValueError as e:
+        print(f"❌ {str(e)}")
+        exit(1)
+    
+    print("\nInitializing Supabase connection...")
+    try:
+        get_supabase()
+        print("✅ Supabase client created")
+    except Exception as e:
+        print(f"❌ Failed to create Supabase client: {str(e)}")
+        exit(1)
+    
     print("\n💰 Financial Advisor with Smart Reminder Management")
     print("="*55)
     print("Hi! I'm your financial advisor. I can help with:")
@@ -535,7 +706,9 @@ if __name__ == "__main__":
                 break
                 
             response = financial_chat(user_input)
-            print(f"\nAdvisor: {response}\n")
+            # One write + flush per reply instead of print's per-line flushing
+            sys.stdout.write("\nAdvisor: " + response + "\n\n")
+            sys.stdout.flush()
             
         except KeyboardInterrupt:
             print("\nSession ended. Your reminders are saved in the database.")
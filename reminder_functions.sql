@@ -0,0 +1,44 @@
+-- Fuzzy title lookups for delete_reminder / mark_reminder_done in app.py.
+-- Run once in the Supabase SQL editor. Each function matches titles with
+-- ILIKE '%search%' and, when nothing matches, falls back to the single
+-- closest title by trigram similarity, all in one round-trip.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE OR REPLACE FUNCTION delete_reminder_fuzzy(search TEXT)
+RETURNS SETOF payment_reminders
+LANGUAGE sql
+AS $$
+    WITH matches AS (
+        SELECT id FROM payment_reminders
+        WHERE title ILIKE '%' || search || '%'
+    ), closest AS (
+        SELECT id FROM payment_reminders
+        WHERE NOT EXISTS (SELECT 1 FROM matches)
+          AND similarity(title, search) > 0.3
+        ORDER BY similarity(title, search) DESC
+        LIMIT 1
+    )
+    DELETE FROM payment_reminders
+    WHERE id IN (SELECT id FROM matches UNION ALL SELECT id FROM closest)
+    RETURNING *;
+$$;
+
+CREATE OR REPLACE FUNCTION mark_reminder_done_fuzzy(search TEXT)
+RETURNS SETOF payment_reminders
+LANGUAGE sql
+AS $$
+    WITH matches AS (
+        SELECT id FROM payment_reminders
+        WHERE title ILIKE '%' || search || '%'
+    ), closest AS (
+        SELECT id FROM payment_reminders
+        WHERE NOT EXISTS (SELECT 1 FROM matches)
+          AND similarity(title, search) > 0.3
+        ORDER BY similarity(title, search) DESC
+        LIMIT 1
+    )
+    UPDATE payment_reminders SET is_done = TRUE
+    WHERE id IN (SELECT id FROM matches UNION ALL SELECT id FROM closest)
+    RETURNING *;
+$$;